@@ -6,16 +6,31 @@ Goal: a curated, scenario-oriented report (similar to test-report.html) that:
 - Groups tests into meaningful module buckets.
 - Visualizes the key scenario data that tests already print to the console.
 - Keeps a collapsible "Raw Console Output" section for auditability.
+
+test-output.txt is read in a single pass: each line is classified once by
+LINE_RE and the suite tree is built from that stream. Report landmarks are
+located with plain substring searches over the mapped file, so each report
+parser decodes only its own block.
 """
 
 from __future__ import annotations
 
+import argparse
+import codecs
+import contextlib
 import datetime as dt
+import functools
+import heapq
 import html
 import json
+import mmap
+import os
 import re
+import shutil
+from bisect import bisect_left
+from collections import Counter
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 ROOT = Path(__file__).resolve().parents[1]
 TEST_OUTPUT = ROOT / "test-output.txt"
@@ -24,10 +39,154 @@ OUT_HTML = ROOT / "test-report-alpha.html"
 OUT_RESULTS = ROOT / "test-results.json"
 OUT_STRUCTURE = ROOT / "test-structure.json"
 
-PASS_RE = re.compile(r"^\s*✔\s+(.*?)(?:\s*\((\d+)ms\))?\s*$")
-PEND_RE = re.compile(r"^\s*-\s+(.*)\s*$")
-SUMMARY_PASS_RE = re.compile(r"^\s*(\d+)\s+passing\s*\(([^)]+)\)\s*$")
-SUMMARY_PEND_RE = re.compile(r"^\s*(\d+)\s+pending\s*$")
+# test-output.txt is mapped rather than read; an empty file maps to b"".
+Buffer = Union[bytes, mmap.mmap]
+
+# A classified console line: LINE_RE over the buffer, or TEXT_LINE_RE over a
+# decoded line (see scan).
+LineMatch = Union["re.Match[bytes]", "re.Match[str]"]
+
+# Line boundaries str.splitlines() knows besides "\n", as UTF-8: CR, VT, FF,
+# FS/GS/RS, NEL and the Unicode line and paragraph separators.
+LINE_BREAKS = (b"\r", b"\x0b", b"\x0c", b"\x1c", b"\x1d", b"\x1e", b"\xc2\x85", b"\xe2\x80\xa8", b"\xe2\x80\xa9")
+
+# Bytes of raw console decoded, escaped and written at a time.
+RAW_SLICE = 1 << 20
+
+# Console landmarks the report parsers slice blocks between: (kind, text, exact).
+# Exact landmarks must be the whole (stripped) line, the rest may appear anywhere
+# in a line, test titles included. One line can carry several landmarks.
+LANDMARKS = (
+    ("arb_report", "GAS ANALYSIS REPORT", True),
+    ("arb_scale", "Scaling Projections:", True),
+    ("cf_report", "## Average Player Cost Analysis", True),
+    ("cf_end", "END OF REPORT", True),
+    ("cf_auto", "AUTO-START GAS COST", False),
+    ("cf_auto_end", "Phase 3:", False),
+    ("cf_sat", "✅ CONTRACT SATURATION COMPLETE", False),
+    ("cf_sat_end", "Phase 2:", False),
+    ("cf_long", "SCENARIO 1: Long Game", False),
+    ("cf_long_end", "SCENARIO 2:", False),
+    ("esc_report", "=== COMPREHENSIVE ESCALATION TEST ===", True),
+    ("esc_end", "COMPREHENSIVE ESCALATION TEST PASSED", False),
+    ("esc_round0", "=== ROUND 0 SUMMARY ===", True),
+    ("esc_validated", "Validated:", True),
+    ("iso_report", "COMPREHENSIVE TEST SUMMARY", False),
+    ("iso_end", "ALL COMPREHENSIVE CHECKS PASSED", False),
+    ("tictac_enroll", "Gas used for enrollment:", False),
+    ("tictac_move", "Gas used for move:", False),
+    ("arb_table", "Match#", False),
+    ("arb_completed", "✅ Completed ", False),
+)
+
+# One alternation classifies every console line; ``m.lastgroup`` names the
+# kind. It is matched as bytes against one line of the mapped file at a time
+# (via pos/endpos, hence no ``^``), so only captured fragments get decoded.
+# Landmarks are not classified here (see find_landmarks). As the pattern is
+# bytes, ``\s`` is ASCII whitespace only; lines holding any other whitespace
+# are matched as text with TEXT_LINE_RE instead. Lines the suite tree would
+# discard anyway (less than two spaces of indent, or box-drawing/banner
+# decoration) are tagged "flush"/"decor" so it can drop them without looking at
+# them again.
+LINE_PATTERN = (
+    r"(?:"
+    r"(?P<blank>\s*)"
+    r"|(?P<prompt>\s*> .*\S.*)"
+    r"|(?P<summary_pass>\s*(?P<pass_count>\d+)\s+passing\s*\((?P<duration>[^)]+)\)\s*)"
+    r"|(?P<summary_pend>\s*(?P<pend_count>\d+)\s+pending\s*)"
+    r"|(?P<pass>\s*✔\s+(?P<pass_name>.*?)(?:\s*\((?P<pass_ms>\d+)ms\))?\s*)"
+    r"|(?P<pend>\s*-\s+(?P<pend_name>.*)\s*)"
+    r"|(?P<rule>\s*=+\s*)"
+    r"|(?P<flush> ?\S.*)"
+    r"|(?P<decor>\s*(?:┌|│|└|##|===).*)"
+    r"|(?P<text>.*)"
+    r")$"
+)
+LINE_RE = re.compile(LINE_PATTERN.encode("utf-8"))
+TEXT_LINE_RE = re.compile(LINE_PATTERN)
+
+# Whitespace that str.isspace() knows and bytes ``\s`` does not, as UTF-8: FS
+# to US, NEL, NBSP, U+1680, U+2000-U+200A, U+2028/9, U+202F, U+205F and U+3000.
+# Starting from a byte class lets the search skip ahead quickly; the
+# lookbehinds then check the rest of the sequence.
+WIDE_SPACE_RE = re.compile(
+    rb"[\x1c-\x1f\xc2\xe1\xe2\xe3]"
+    rb"(?:(?<=[\x1c-\x1f])|(?<=\xc2)[\x85\xa0]|(?<=\xe1)\x9a\x80"
+    rb"|(?<=\xe2)(?:\x80[\x80-\x8a\xa8\xa9\xaf]|\x81\x9f)|(?<=\xe3)\x80\x80)"
+)
+
+# Kinds that never open a suite or record a test.
+SKIP_KINDS = frozenset(["blank", "prompt", "summary_pass", "summary_pend", "flush", "decor"])
+
+# Kinds whose line offsets are recorded during the scan.
+MARK_KINDS = frozenset(["summary_pass", "summary_pend", "rule"])
+
+# Arbitrum storage growth report
+ARB_COMPLETED_RE = re.compile(r"✅ Completed ([\d,]+) total matches")
+ARB_FIRST_TOTAL_RE = re.compile(r"First match avg gas:\s*([\d,]+)")
+ARB_LAST_LINE_RE = re.compile(r"\d+(?:st|nd|rd|th) match avg gas:")
+ARB_LAST_RE = re.compile(r"(\d+)(?:st|nd|rd|th) match avg gas:\s*([\d,]+)")
+ARB_RECORDS_RE = re.compile(r"Total MatchRecords:\s*([\d,]+)")
+ARB_BYTES_RE = re.compile(r"Bytes:\s*([\d,]+)\s*bytes")
+ARB_MB_RE = re.compile(r"Megabytes:\s*([0-9.]+)\s*MB")
+ARB_PER_PLAYER_KB_RE = re.compile(r"=\s*([0-9.]+)\s*KB")
+ARB_PROJ_RE = re.compile(r"^\s*([\d,]+)\s+players\s+.\s*([\d,]+)\s+matches:\s*$")
+ARB_PROJ_STORAGE_RE = re.compile(r"Storage:\s*([0-9.]+\s*(?:MB|GB))\s*\(([\d,]+)\s+records\)")
+# Match#, Enrollment, Move 1, Move 2, Move 3, Move 4*, Total, Delta; empty cells
+# are skipped and anything past the eighth column is ignored.
+ARB_ROW_KEYS = ("match", "enroll", "m1", "m2", "m3", "m4", "total", "delta")
+ARB_ROW_RE = re.compile(
+    r"[\s|]*(\d+)\s*" + r"\|[\s|]*([^|\s](?:[^|]*[^|\s])?)\s*" * (len(ARB_ROW_KEYS) - 1) + r"(?:\|.*)?"
+)
+
+# ConnectFour maximum capacity report
+CF_PLAYERS_RE = re.compile(r"- Players Tracked:\s*(\d+)")
+CF_TOTAL_GAS_ALL_RE = re.compile(r"- Total Gas \(All Players\):\s*([\d,]+)")
+CF_AVG_GAS_RE = re.compile(r"- Average Gas per Player:\s*([\d,]+)")
+CF_AVG_COST_ETH_RE = re.compile(r"- Average Cost @ 0\.05 gwei:\s*([0-9.]+)\s*ETH")
+CF_AVG_COST_USD_RE = re.compile(r"- Average Cost @ 0\.05 gwei:\s*\$([0-9.]+)")
+CF_MAX_PLAYER_RE = re.compile(r"- Player Address:\s*(0x[0-9a-fA-F]+)")
+CF_MAX_TOTAL_GAS_RE = re.compile(r"- Total Gas Spent:\s*([\d,]+)")
+CF_MAX_TXS_RE = re.compile(r"- Total Transactions:\s*(\d+)")
+CF_MAX_COST_ETH_RE = re.compile(r"- Cost @ 0\.05 gwei:\s*([0-9.]+)\s*ETH")
+CF_MAX_COST_USD_RE = re.compile(r"- Cost @ 0\.05 gwei:\s*\$([0-9.]+)")
+# Report fields taken from the first line that matches each pattern.
+CF_REPORT_FIELDS = (
+    ("playersTracked", CF_PLAYERS_RE),
+    ("totalGasAll", CF_TOTAL_GAS_ALL_RE),
+    ("avgGasPerPlayer", CF_AVG_GAS_RE),
+    ("avgCostEth", CF_AVG_COST_ETH_RE),
+    ("avgCostUsd", CF_AVG_COST_USD_RE),
+    ("maxPlayer", CF_MAX_PLAYER_RE),
+    ("maxTotalGas", CF_MAX_TOTAL_GAS_RE),
+    ("maxTxs", CF_MAX_TXS_RE),
+    ("maxCostEth", CF_MAX_COST_ETH_RE),
+    # There are multiple USD lines; the first one is the max player's.
+    ("maxCostUsd", CF_MAX_COST_USD_RE),
+)
+# The section patterns below run over a whole block of text at once. Each one
+# matches at most once per line ("^.*?" takes the first hit on a line) and
+# never spans lines (whitespace is [^\S\n]).
+CF_AUTO_GAS_RE = re.compile(r"^[^\S\n]*Gas:[^\S\n]*([\d,]+)", re.M)
+CF_AUTO_COST_RE = re.compile(r"^[^\S\n]*Cost:[^\S\n]*([0-9.]+)[^\S\n]*ETH[^\S\n]*\(\$([0-9.]+)\)", re.M)
+CF_SAT_PLAYERS_RE = re.compile(r"^.*?Total Players:[^\S\n]*(\d+)", re.M)
+CF_SAT_TOURNAMENTS_RE = re.compile(r"^.*?Active Tournaments:[^\S\n]*(\d+)", re.M)
+CF_LONG_MOVE_RE = re.compile(
+    r"^.*?Move[^\S\n]+(\d+/\d+)[^\S\n]+complete[^\S\n]+-[^\S\n]+Gas:[^\S\n]*(\d+)", re.M
+)
+CF_NET_ROW_RE = re.compile(r"│\s*(0?\.?\d+)\s*gwei\s*│\s*([0-9.]+)\s*│\s*([0-9.]+)\s*│")
+CF_NET_USD_RE = re.compile(r"\(\$([0-9.]+)")
+CF_OPS_RE = {
+    label: re.compile(
+        rf"{re.escape(label)}:\s*\n\s*Count:\s*(\d+)\s*\n\s*Total Gas:\s*([\d,]+)\s*\n\s*Average Gas:\s*([\d,]+)",
+        flags=re.S,
+    )
+    for label in ("ENROLLMENTS", "MOVES")
+}
+
+# TicTacChain gas console logs
+TICTAC_ENROLL_RE = re.compile(r"Gas used for enrollment:\s*(\d+)")
+TICTAC_MOVE_RE = re.compile(r"Gas used for move:\s*(\d+)")
 
 DROP_SUITE_EXACT = {
     "'constructor',",
@@ -46,49 +205,282 @@ DROP_SUITE_EXACT = {
     "'fromJSON'",
 }
 
-
-def esc(s: str) -> str:
+# Console lines that end up looking like suites: tracker/reporter dumps, gas
+# and storage figures, box drawing, banners and emoji status lines.
+NOISE_PREFIXES = (
+    "StateTracker",
+    "Scientific Reporter",
+    "Gas used",
+    "Gas:",
+    "Cost:",
+    "Bytes:",
+    "Kilobytes:",
+    "Megabytes:",
+    "┌",
+    "│",
+    "└",
+    "##",
+    "===",
+    "•",
+    "*",
+    "✓",
+    "✅",
+    "🎉",
+    "🚨",
+    "🎮",
+    "🚀",
+    "💎",
+    "📊",
+    "⚠",
+    "Match ",
+    "Move ",
+    "Player",
+    "Status",
+    "Round ",
+    "Tier ",
+    "Phase ",
+)
+NOISE_PREFIX_RE = re.compile("|".join(map(re.escape, NOISE_PREFIXES)))
+
+# Label/value log lines like "Player1: 0xabc..." or "Players tracked: 136"
+LABEL_VALUE_RE = re.compile(r"[A-Za-z0-9_() ./-]+:\s*(?:0x|\$|[0-9])")
+
+# Heuristic test categories in priority order, with the keywords that tag them.
+CATEGORY_KEYWORDS = (
+    ("Gas & Performance", ("gas", "storage", "capacity")),
+    ("Escalation & Timeouts", ("escalation", "timeout", "force start", "ml", "el", "abandoned")),
+    ("All-Draw Resolution", ("all-draw", "all draw")),
+    ("Economics & Prizes", ("prize", "fee", "earnings", "raffle", "reserve")),
+    ("Events & Records", ("event", "transfer", "record")),
+    ("Views & Data Integrity", ("view", "leaderboard", "stats", "info")),
+    ("Edge Cases & Regression", ("bug", "regression", "edge case", "persistence", "cache")),
+)
+
+# Stylesheet shared with test-report.html
+STYLE_RE = re.compile(r"<style>\s*(.*?)\s*</style>", flags=re.S | re.I)
+
+# Characters html.escape(quote=True) rewrites.
+HTML_UNSAFE_RE = re.compile(r"[&<>\"']")
+
+
+def esc(s: Optional[str]) -> str:
+    if not s:
+        return ""
+    # Most names and figures need no escaping; hand those back without copying.
+    if not HTML_UNSAFE_RE.search(s):
+        return s
     return html.escape(s, quote=True)
 
 
+def esc_str(v: Union[int, str, None]) -> str:
+    # Integers render as digits only; no need to scan them for markup.
+    if isinstance(v, int):
+        return str(v)
+    return esc(v)
+
+
+@functools.lru_cache(maxsize=1024)
 def parse_int(s: str) -> int:
     return int(s.replace(",", "").strip())
 
 
-def last_match(lines: List[str], rx: re.Pattern[str]) -> Optional[re.Match[str]]:
-    for line in reversed(lines):
-        m = rx.match(line)
-        if m:
-            return m
-    return None
+@contextlib.contextmanager
+def map_output(path: Path) -> Iterator[Buffer]:
+    """Map test-output.txt read-only instead of loading it as a list of lines.
 
+    Lines in the buffer end at "\n" only. A console with any other boundary
+    str.splitlines() splits on (CRLF, lone CR, form feed, U+2028, ...) is
+    decoded and rejoined with "\n" instead, so it splits into the same lines.
+    """
+    with path.open("rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if not any(mm.find(sep) >= 0 for sep in LINE_BREAKS):
+                yield mm
+                return
+            text = decode(mm[:])
+        yield "".join(l + "\n" for l in text.splitlines()).encode("utf-8")
 
-def find_index(lines: List[str], pred, start: int = 0) -> Optional[int]:
-    for i in range(start, len(lines)):
-        if pred(lines[i]):
-            return i
-    return None
 
+def next_line(buf: Buffer, pos: int, n: int = 1) -> int:
+    """Offset of the line ``n`` lines after the one starting at ``pos`` (or EOF)."""
+    for _ in range(n):
+        nl = buf.find(b"\n", pos)
+        if nl < 0:
+            return len(buf)
+        pos = nl + 1
+    return pos
 
-def extract_block(
-    lines: List[str], start_pred, end_pred, *, include_end: bool = False
-) -> List[str]:
-    start = find_index(lines, start_pred)
+
+def decode(b: bytes) -> str:
+    return b.decode("utf-8", errors="replace")
+
+
+def decode_lines(buf: Buffer, start: int, stop: int) -> List[str]:
+    return decode(buf[start:stop]).splitlines()
+
+
+def line_end(buf: Buffer, pos: int) -> int:
+    """Offset just past the content of the line at ``pos`` (before its newline)."""
+    nl = buf.find(b"\n", pos)
+    return len(buf) if nl < 0 else nl
+
+
+def line_at(buf: Buffer, pos: int) -> str:
+    return decode(buf[pos : line_end(buf, pos)])
+
+
+def match_line(buf: Buffer, pos: int) -> LineMatch:
+    end = line_end(buf, pos)
+    if WIDE_SPACE_RE.search(buf, pos, end):
+        return TEXT_LINE_RE.match(decode(buf[pos:end]))
+    return LINE_RE.match(buf, pos, end)
+
+
+def group_text(m: LineMatch, group: Union[int, str] = 0) -> str:
+    """A classified line's group as text, whichever pattern matched it."""
+    g = m.group(group)
+    return g if isinstance(g, str) else decode(g)
+
+
+def scan(buf: Buffer) -> Iterator[Tuple[str, LineMatch, int]]:
+    """Classify each console line once, yielding ``(kind, match, offset)``.
+
+    Each line is matched in place in ``buf``; nothing is decoded here, callers
+    decode only the groups they keep. The exception is the (rare) lines with
+    whitespace bytes ``\s`` does not cover, which are decoded and matched
+    with TEXT_LINE_RE so they classify as the text would.
+    """
+    match = LINE_RE.match
+    find = buf.find
+    pos, size = 0, len(buf)
+    wide = iter(sorted({buf.rfind(b"\n", 0, w.start()) + 1 for w in WIDE_SPACE_RE.finditer(buf)}))
+    next_wide = next(wide, size)
+    while pos < size:
+        nl = find(b"\n", pos)
+        if nl < 0:
+            nl = size
+        if pos == next_wide:
+            m = TEXT_LINE_RE.match(decode(buf[pos:nl]))
+            next_wide = next(wide, size)
+        else:
+            m = match(buf, pos, nl)
+        yield m.lastgroup, m, pos
+        pos = nl + 1
+
+
+def record_marks(
+    events: Iterable[Tuple[str, LineMatch, int]], marks: Dict[str, List[int]]
+) -> Iterator[Tuple[str, LineMatch, int]]:
+    """Pass events through, appending the line offsets of MARK_KINDS to ``marks``.
+
+    The offset lists stay plain lists: they are only ever appended to here and
+    are searched with bisect afterwards, which needs cheap random access.
+    """
+    for ev in events:
+        if ev[0] in MARK_KINDS:
+            marks.setdefault(ev[0], []).append(ev[2])
+        yield ev
+
+
+def find_landmarks(buf: Buffer) -> Dict[str, List[int]]:
+    """Line offsets of every LANDMARKS line, by kind, in file order.
+
+    Each landmark text is searched for across the whole buffer, which is much
+    cheaper than trying it against every line; only the lines it turns up in
+    are looked at.
+    """
+    marks: Dict[str, List[int]] = {}
+    find = buf.find
+    for kind, text, exact in LANDMARKS:
+        needle = text.encode("utf-8")
+        offsets: List[int] = []
+        at = find(needle)
+        while at >= 0:
+            start = buf.rfind(b"\n", 0, at) + 1
+            end = line_end(buf, start)
+            if not exact or decode(buf[start:end]).strip() == text:
+                offsets.append(start)
+            # One hit per line is enough; carry on from the next line.
+            at = find(needle, end)
+        if offsets:
+            marks[kind] = offsets
+    return marks
+
+
+def first_mark(marks: Dict[str, List[int]], kind: str, start: int = 0) -> Optional[int]:
+    idx = marks.get(kind)
+    if not idx:
+        return None
+    k = bisect_left(idx, start)
+    return idx[k] if k < len(idx) else None
+
+
+def marks_in(marks: Dict[str, List[int]], kind: str, start: int, stop: int) -> List[int]:
+    """All ``kind`` landmarks inside ``[start, stop)``."""
+    offsets = marks.get(kind, [])
+    return offsets[bisect_left(offsets, start) : bisect_left(offsets, stop)]
+
+
+def mark_in(marks: Dict[str, List[int]], kind: str, start: int, stop: int) -> Optional[int]:
+    """First ``kind`` landmark inside ``[start, stop)``, if any."""
+    at = first_mark(marks, kind, start)
+    return at if at is not None and at < stop else None
+
+
+def mark_span(
+    buf: Buffer,
+    marks: Dict[str, List[int]],
+    start_kind: str,
+    end_kind: str,
+    *,
+    include_end: bool = False,
+) -> Optional[Tuple[int, int]]:
+    start = first_mark(marks, start_kind)
     if start is None:
-        return []
-    out: List[str] = []
-    for i in range(start, len(lines)):
-        out.append(lines[i])
-        if end_pred(lines[i]):
-            if not include_end:
-                out.pop()
-            break
-    return out
+        return None
+    end = first_mark(marks, end_kind, start)
+    if end is None:
+        return start, len(buf)
+    return start, next_line(buf, end) if include_end else end
+
+
+def mark_text(
+    buf: Buffer,
+    marks: Dict[str, List[int]],
+    start_kind: str,
+    end_kind: str,
+    *,
+    include_end: bool = False,
+) -> str:
+    span = mark_span(buf, marks, start_kind, end_kind, include_end=include_end)
+    return decode(buf[span[0] : span[1]]) if span else ""
+
+
+def mark_block(
+    buf: Buffer,
+    marks: Dict[str, List[int]],
+    start_kind: str,
+    end_kind: str,
+    *,
+    include_end: bool = False,
+) -> List[str]:
+    return mark_text(buf, marks, start_kind, end_kind, include_end=include_end).splitlines()
+
+
+def last_match(pat: re.Pattern[str], text: str) -> Optional[re.Match[str]]:
+    m = None
+    for m in pat.finditer(text):
+        pass
+    return m
 
 
+@functools.lru_cache(maxsize=1)
 def extract_css_from_base() -> str:
     raw = BASE_REPORT.read_text(encoding="utf-8")
-    m = re.search(r"<style>\s*(.*?)\s*</style>", raw, flags=re.S | re.I)
+    m = STYLE_RE.search(raw)
     if not m:
         raise RuntimeError("Could not extract <style> from test-report.html")
     return m.group(1)
@@ -98,253 +490,226 @@ def is_noise_suite_name(name: str) -> bool:
     t = name.strip()
     if not t:
         return True
-    if t in DROP_SUITE_EXACT:
-        return True
-    if t.startswith(("StateTracker", "Scientific Reporter")):
-        return True
-    if t.startswith(("Gas used", "Gas:", "Cost:", "Bytes:", "Kilobytes:", "Megabytes:")):
-        return True
-    if t.startswith(("┌", "│", "└", "##", "===", "====", "•", "*")):
-        return True
-    if t.startswith(("✓", "✅", "🎉", "🚨", "🎮", "🚀", "💎", "📊", "⚠")):
-        return True
-    if t.startswith(("Match ", "Move ", "Player", "Status", "Round ", "Tier ", "Phase ")):
-        return True
-
-    # Label/value log lines like "Player1: 0xabc..." or "Players tracked: 136"
-    m = re.match(r"^[A-Za-z0-9_() ./-]+:\s*(.+)$", t)
-    if m:
-        rhs = m.group(1).strip()
-        if rhs.startswith(("0x", "$")):
-            return True
-        if re.match(r"^[0-9]", rhs):
-            return True
-    return False
-
-
-def merge_noise_suites(node: Dict[str, Any]) -> None:
-    # Clean children first
-    new_children: List[Dict[str, Any]] = []
-    for child in node.get("subsuites", []):
-        merge_noise_suites(child)
-        if is_noise_suite_name(child.get("name", "")):
-            node.setdefault("tests", []).extend(child.get("tests", []))
-            node.setdefault("subsuites", []).extend(child.get("subsuites", []))
-            continue
-        if child.get("tests") or child.get("subsuites"):
-            new_children.append(child)
-    node["subsuites"] = new_children
-
-
-def parse_suite_tree(lines: List[str]) -> List[Dict[str, Any]]:
+    return t in DROP_SUITE_EXACT or bool(NOISE_PREFIX_RE.match(t)) or bool(LABEL_VALUE_RE.match(t))
+
+
+def merge_noise_suites(root: Dict[str, Any]) -> None:
+    # Every node is built with "tests" and "subsuites" lists, so they can be
+    # extended in place. Visit in reverse pre-order: children are always
+    # cleaned before their parent folds them in.
+    order: List[Dict[str, Any]] = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        stack.extend(node["subsuites"])
+
+    for node in reversed(order):
+        kept: List[Dict[str, Any]] = []
+        promoted: List[Dict[str, Any]] = []
+        for child in node["subsuites"]:
+            if is_noise_suite_name(child["name"]):
+                node["tests"].extend(child["tests"])
+                promoted.extend(child["subsuites"])
+            elif child["tests"] or child["subsuites"]:
+                kept.append(child)
+        # Promoted grandchildren are already clean; they follow the kept children.
+        node["subsuites"] = kept + promoted
+
+
+def parse_suite_tree(events: Iterable[Tuple[str, LineMatch, int]]) -> List[Dict[str, Any]]:
     root: List[Dict[str, Any]] = []
-    stack: List[Tuple[int, Dict[str, Any]]] = []
-
-    for raw in lines:
-        line = raw.rstrip("\n")
-        if not line.strip():
-            continue
-        if line.strip().startswith("> "):
-            continue
-        if SUMMARY_PASS_RE.match(line) or SUMMARY_PEND_RE.match(line):
+    # Open suites as parallel stacks (indent, node), innermost last; ``tests`` is
+    # the innermost suite's test list so pass/pending lines append directly.
+    indents: List[int] = []
+    nodes: List[Dict[str, Any]] = []
+    tests: Optional[List[Dict[str, Any]]] = None
+
+    for kind, m, _ in events:
+        if kind == "pass":
+            if tests is not None:
+                ms = m.group("pass_ms")
+                tests.append(
+                    {"name": group_text(m, "pass_name").strip(), "status": "passing", "ms": int(ms) if ms else None}
+                )
             continue
 
-        m = PASS_RE.match(line)
-        if m:
-            name = m.group(1).strip()
-            ms = int(m.group(2)) if m.group(2) else None
-            if stack:
-                stack[-1][1]["tests"].append({"name": name, "status": "passing", "ms": ms})
+        if kind == "pend":
+            if tests is not None:
+                tests.append({"name": group_text(m, "pend_name").strip(), "status": "pending", "ms": None})
             continue
 
-        m = PEND_RE.match(line)
-        if m:
-            name = m.group(1).strip()
-            if stack:
-                stack[-1][1]["tests"].append({"name": name, "status": "pending", "ms": None})
+        if kind in SKIP_KINDS:
             continue
 
-        indent = len(line) - len(line.lstrip(" "))
+        line = group_text(m)
+        stripped = line.lstrip(" ")
+        indent = len(line) - len(stripped)
         if indent < 2:
             continue
 
-        stripped = line.strip()
-        if stripped.startswith(("┌", "│", "└")):
+        stripped = stripped.strip()
+        if not stripped:
             continue
-        if stripped.startswith(("##", "===", "====")):
+        if stripped.startswith(("┌", "│", "└", "##", "===")):
             continue
 
         node: Dict[str, Any] = {"name": stripped, "subsuites": [], "tests": []}
 
-        while stack and indent <= stack[-1][0]:
-            stack.pop()
+        while indents and indent <= indents[-1]:
+            indents.pop()
+            nodes.pop()
 
-        if stack:
-            stack[-1][1]["subsuites"].append(node)
+        if nodes:
+            nodes[-1]["subsuites"].append(node)
         else:
             root.append(node)
 
-        stack.append((indent, node))
+        indents.append(indent)
+        nodes.append(node)
+        tests = node["tests"]
 
     cleaned: List[Dict[str, Any]] = []
     for s in root:
         merge_noise_suites(s)
-        if is_noise_suite_name(s.get("name", "")):
+        if is_noise_suite_name(s["name"]):
             continue
-        if s.get("tests") or s.get("subsuites"):
+        if s["tests"] or s["subsuites"]:
             cleaned.append(s)
     return cleaned
 
 
-def count_suite(node: Dict[str, Any]) -> Tuple[int, int]:
-    p = sum(1 for t in node.get("tests", []) if t.get("status") == "passing")
-    q = sum(1 for t in node.get("tests", []) if t.get("status") == "pending")
-    for sub in node.get("subsuites", []):
-        sp, sq = count_suite(sub)
-        p += sp
-        q += sq
-    return p, q
+def iter_suite_tests(suites: List[Dict[str, Any]]) -> Iterator[Tuple[Tuple[str, ...], List[Dict[str, Any]]]]:
+    """Yield ``(path, tests)`` for every suite with tests, depth first.
 
-
-def flatten_tests(node: Dict[str, Any], path: List[str]) -> List[Tuple[List[str], Dict[str, Any]]]:
-    out: List[Tuple[List[str], Dict[str, Any]]] = []
-    next_path = path + [node.get("name", "")]
-    for t in node.get("tests", []):
-        out.append((next_path, t))
-    for sub in node.get("subsuites", []):
-        out.extend(flatten_tests(sub, next_path))
-    return out
-
-
-def group_for_path(path: List[str]) -> str:
+    Walks an explicit stack rather than recursing; each path is a tuple that
+    extends its parent's, so it can be kept (and hashed) as is.
+    """
+    stack: List[Tuple[Dict[str, Any], Tuple[str, ...]]] = [(s, ()) for s in reversed(suites)]
+    while stack:
+        node, parent = stack.pop()
+        path = parent + (node["name"],)
+        tests = node["tests"]
+        if tests:
+            yield path, tests
+        stack.extend((sub, path) for sub in reversed(node["subsuites"]))
+
+
+@functools.lru_cache(maxsize=4096)
+def path_group(path: Tuple[str, ...]) -> Tuple[str, str]:
+    """Lowercased suite path (the category haystack prefix) and its group."""
     joined = " ".join(path).lower()
     if "connectfour" in joined:
-        return "ConnectFourOnChain"
+        return joined, "ConnectFourOnChain"
     if "chess" in joined:
-        return "ChessOnChain"
+        return joined, "ChessOnChain"
     if "tictac" in joined:
-        return "TicTacChain"
+        return joined, "TicTacChain"
     if "arbitrum storage gas cost analysis" in joined:
-        return "Gas & Storage"
+        return joined, "Gas & Storage"
     if any(k in joined for k in ("gas", "storage", "capacity")):
-        return "Gas & Performance"
-    return "Protocol Core"
-
-
-def category_for_test(path: List[str], test_name: str) -> str:
-    hay = (" ".join(path) + " " + test_name).lower()
-    if any(k in hay for k in ("gas", "storage", "capacity")):
-        return "Gas & Performance"
-    if any(k in hay for k in ("escalation", "timeout", "force start", "ml", "el", "abandoned")):
-        return "Escalation & Timeouts"
-    if "all-draw" in hay or "all draw" in hay:
-        return "All-Draw Resolution"
-    if any(k in hay for k in ("prize", "fee", "earnings", "raffle", "reserve")):
-        return "Economics & Prizes"
-    if any(k in hay for k in ("event", "transfer", "record")):
-        return "Events & Records"
-    if any(k in hay for k in ("view", "leaderboard", "stats", "info")):
-        return "Views & Data Integrity"
-    if any(k in hay for k in ("bug", "regression", "edge case", "persistence", "cache")):
-        return "Edge Cases & Regression"
-    return "Game & Tournament Logic"
-
-
-def parse_arbitrum_gas(lines: List[str]) -> Dict[str, Any]:
-    start = find_index(lines, lambda l: l.strip() == "GAS ANALYSIS REPORT")
+        return joined, "Gas & Performance"
+    return joined, "Protocol Core"
+
+
+@functools.lru_cache(maxsize=4096)
+def classify(path: Tuple[str, ...], test_name: str) -> Tuple[str, str]:
+    """(group, category) for a test, lowercasing its suite path only once."""
+    joined, group = path_group(path)
+    hay = joined + " " + test_name.lower()
+    for cat, kws in CATEGORY_KEYWORDS:
+        if any(k in hay for k in kws):
+            return group, cat
+    return group, "Game & Tournament Logic"
+
+
+def parse_arbitrum_gas(buf: Buffer, marks: Dict[str, List[int]]) -> Dict[str, Any]:
+    start = first_mark(marks, "arb_report")
     if start is None:
         return {}
 
     # End after scaling projections (use the next ===== line after that header)
-    scale = find_index(lines, lambda l: l.strip() == "Scaling Projections:", start=start)
+    scale = first_mark(marks, "arb_scale", start)
     if scale is None:
         return {}
-    end = find_index(lines, lambda l: bool(re.match(r"^=+$", l.strip())), start=scale)
+    end = first_mark(marks, "rule", scale)
     if end is None:
-        end = min(len(lines), scale + 50)
+        end = next_line(buf, scale, 50)
 
-    block = lines[start:end]
+    # Split at the projections header so its position in the block is known.
+    head = decode_lines(buf, start, scale)
+    block = head + decode_lines(buf, scale, end)
 
     total_matches = None
-    m = re.search(r"✅ Completed ([\d,]+) total matches", "\n".join(lines))
-    if m:
-        total_matches = m.group(1)
+    for at in marks.get("arb_completed", []):
+        m = ARB_COMPLETED_RE.search(line_at(buf, at))
+        if m:
+            total_matches = m.group(1)
+            break
 
-    # Average gas table
-    table_start = find_index(block, lambda l: l.strip().startswith("Match#") and "|" in l)
+    # Average gas table: rows start two lines below the first "Match# |" header
+    # in the block and run for at most 38 lines.
+    table_at = None
+    for at in marks_in(marks, "arb_table", start, end):
+        l = line_at(buf, at)
+        if l.strip().startswith("Match#") and "|" in l:
+            table_at = at
+            break
     rows: List[Dict[str, str]] = []
-    if table_start is not None:
-        for l in block[table_start + 2 : table_start + 40]:
+    if table_at is not None:
+        for l in decode_lines(buf, next_line(buf, table_at, 2), min(next_line(buf, table_at, 40), end)):
             if "|" not in l:
                 break
-            cols = [c.strip() for c in l.split("|") if c.strip()]
-            if not cols or not cols[0].isdigit():
-                continue
-            # Expected columns:
-            # Match#, Enrollment, Move 1, Move 2, Move 3, Move 4*, Total, Delta
-            if len(cols) >= 8:
-                rows.append(
-                    {
-                        "match": cols[0],
-                        "enroll": cols[1],
-                        "m1": cols[2],
-                        "m2": cols[3],
-                        "m3": cols[4],
-                        "m4": cols[5],
-                        "total": cols[6],
-                        "delta": cols[7],
-                    }
-                )
+            m = ARB_ROW_RE.fullmatch(l)
+            if m:
+                rows.append(dict(zip(ARB_ROW_KEYS, m.groups())))
 
-    def grab(rx: str) -> Optional[str]:
-        r = re.compile(rx)
+    def grab(pat: re.Pattern[str]) -> Optional[str]:
         for l in block:
-            m2 = r.search(l)
+            m2 = pat.search(l)
             if m2:
                 return m2.group(1)
         return None
 
-    first_total = grab(r"First match avg gas:\s*([\d,]+)")
+    first_total = grab(ARB_FIRST_TOTAL_RE)
     last_match_n = None
     last_total = None
     last_line = None
     for l in block:
-        if re.search(r"\d+(?:st|nd|rd|th) match avg gas:", l):
+        if ARB_LAST_LINE_RE.search(l):
             last_line = l
     if last_line:
-        m2 = re.search(r"(\d+)(?:st|nd|rd|th) match avg gas:\s*([\d,]+)", last_line)
+        m2 = ARB_LAST_RE.search(last_line)
         if m2:
             last_match_n = int(m2.group(1))
             last_total = m2.group(2)
 
-    total_records = grab(r"Total MatchRecords:\s*([\d,]+)")
-    total_storage_bytes = grab(r"Bytes:\s*([\d,]+)\s*bytes")
-    total_storage_mb = grab(r"Megabytes:\s*([0-9.]+)\s*MB")
-    per_player_kb = grab(r"=\s*([0-9.]+)\s*KB")
+    total_records = grab(ARB_RECORDS_RE)
+    total_storage_bytes = grab(ARB_BYTES_RE)
+    total_storage_mb = grab(ARB_MB_RE)
+    per_player_kb = grab(ARB_PER_PLAYER_KB_RE)
 
     projections: List[Dict[str, str]] = []
-    proj_idx = find_index(block, lambda l: l.strip() == "Scaling Projections:")
-    if proj_idx is not None:
-        i = proj_idx + 1
-        while i < len(block):
-            line = block[i].rstrip()
-            m3 = re.search(r"^\s*([\d,]+)\s+players\s+.\s*([\d,]+)\s+matches:\s*$", line)
-            if m3 and i + 1 < len(block):
-                players = m3.group(1)
-                matches = m3.group(2)
-                m4 = re.search(r"Storage:\s*([0-9.]+\s*(?:MB|GB))\s*\(([\d,]+)\s+records\)", block[i + 1])
-                if m4:
-                    projections.append(
-                        {
-                            "players": players,
-                            "matches": matches,
-                            "storage": m4.group(1),
-                            "records": m4.group(2),
-                        }
-                    )
-                i += 2
-                continue
-            i += 1
+    i = len(head) + 1
+    while i < len(block):
+        line = block[i].rstrip()
+        m3 = ARB_PROJ_RE.search(line)
+        if m3 and i + 1 < len(block):
+            players = m3.group(1)
+            matches = m3.group(2)
+            m4 = ARB_PROJ_STORAGE_RE.search(block[i + 1])
+            if m4:
+                projections.append(
+                    {
+                        "players": players,
+                        "matches": matches,
+                        "storage": m4.group(1),
+                        "records": m4.group(2),
+                    }
+                )
+            i += 2
+            continue
+        i += 1
 
     return {
         "totalMatches": total_matches,
@@ -360,103 +725,62 @@ def parse_arbitrum_gas(lines: List[str]) -> Dict[str, Any]:
     }
 
 
-def parse_connectfour_gas(lines: List[str]) -> Dict[str, Any]:
-    start = find_index(lines, lambda l: l.strip() == "## Average Player Cost Analysis")
-    end = find_index(lines, lambda l: l.strip() == "END OF REPORT", start=start or 0)
+def parse_connectfour_gas(buf: Buffer, marks: Dict[str, List[int]]) -> Dict[str, Any]:
+    start = first_mark(marks, "cf_report")
+    end = first_mark(marks, "cf_end", start or 0)
     if start is None or end is None or end <= start:
         return {}
 
-    block = lines[start:end]
-
-    def grab(rx: str) -> Optional[str]:
-        r = re.compile(rx)
-        for l in block:
-            m = r.search(l)
-            if m:
-                return m.group(1)
-        return None
+    block = decode_lines(buf, start, end)
 
-    players_tracked = grab(r"- Players Tracked:\s*(\d+)")
-    total_gas_all = grab(r"- Total Gas \(All Players\):\s*([\d,]+)")
-    avg_gas = grab(r"- Average Gas per Player:\s*([\d,]+)")
-    avg_cost_eth = grab(r"- Average Cost @ 0\.05 gwei:\s*([0-9.]+)\s*ETH")
-    avg_cost_usd = grab(r"- Average Cost @ 0\.05 gwei:\s*\$([0-9.]+)")
-
-    max_player = grab(r"- Player Address:\s*(0x[0-9a-fA-F]+)")
-    max_total_gas = grab(r"- Total Gas Spent:\s*([\d,]+)")
-    max_txs = grab(r"- Total Transactions:\s*(\d+)")
-    max_cost_eth = grab(r"- Cost @ 0\.05 gwei:\s*([0-9.]+)\s*ETH")
-    # There are multiple USD lines; pick the first.
-    max_cost_usd = None
+    # One walk over the report: each field keeps its first match (and stops
+    # being searched for), and the network cost table (ASCII) is collected
+    # from its "┌" line through the first "└" line.
+    fields: Dict[str, Optional[str]] = dict.fromkeys(key for key, _ in CF_REPORT_FIELDS)
+    pending = list(CF_REPORT_FIELDS)
+    table_lines: List[str] = []
+    in_table = table_done = False
     for l in block:
-        m = re.search(r"- Cost @ 0\.05 gwei:\s*\$([0-9.]+)", l)
-        if m:
-            max_cost_usd = m.group(1)
-            break
+        if pending:
+            hit = False
+            for key, pat in pending:
+                m = pat.search(l)
+                if m:
+                    fields[key] = m.group(1)
+                    hit = True
+            if hit:
+                pending = [f for f in pending if fields[f[0]] is None]
+        if not table_done:
+            s = l.strip()
+            if s.startswith("┌"):
+                in_table = True
+            if in_table:
+                table_lines.append(l)
+                table_done = s.startswith("└")
 
     # Auto-start (outside the report block)
-    auto_block = extract_block(
-        lines,
-        lambda l: "AUTO-START GAS COST" in l,
-        lambda l: "Phase 3:" in l,
-    )
-    auto_gas = None
-    auto_eth = None
-    auto_usd = None
-    for l in auto_block:
-        m = re.search(r"^\s*Gas:\s*([\d,]+)", l)
-        if m:
-            auto_gas = m.group(1)
-        m = re.search(r"^\s*Cost:\s*([0-9.]+)\s*ETH\s*\(\$([0-9.]+)\)", l)
-        if m:
-            auto_eth = m.group(1)
-            auto_usd = m.group(2)
+    auto_text = mark_text(buf, marks, "cf_auto", "cf_auto_end")
+    m = last_match(CF_AUTO_GAS_RE, auto_text)
+    auto_gas = m.group(1) if m else None
+    m = last_match(CF_AUTO_COST_RE, auto_text)
+    auto_eth, auto_usd = m.groups() if m else (None, None)
 
     # Saturation summary (outside the report block)
-    sat_block = extract_block(
-        lines,
-        lambda l: "✅ CONTRACT SATURATION COMPLETE" in l,
-        lambda l: "Phase 2:" in l,
-    )
-    sat_players = None
-    sat_tournaments = None
-    for l in sat_block:
-        m = re.search(r"Total Players:\s*(\d+)", l)
-        if m:
-            sat_players = m.group(1)
-        m = re.search(r"Active Tournaments:\s*(\d+)", l)
-        if m:
-            sat_tournaments = m.group(1)
+    sat_text = mark_text(buf, marks, "cf_sat", "cf_sat_end")
+    m = last_match(CF_SAT_PLAYERS_RE, sat_text)
+    sat_players = m.group(1) if m else None
+    m = last_match(CF_SAT_TOURNAMENTS_RE, sat_text)
+    sat_tournaments = m.group(1) if m else None
 
     # Long game checkpoints (outside the report block)
-    long_block = extract_block(
-        lines,
-        lambda l: "SCENARIO 1: Long Game" in l,
-        lambda l: "SCENARIO 2:" in l,
-    )
-    long_moves: List[Tuple[str, str]] = []
-    for l in long_block:
-        m = re.search(r"Move\s+(\d+/\d+)\s+complete\s+-\s+Gas:\s*(\d+)", l)
-        if m:
-            long_moves.append((m.group(1), m.group(2)))
-
-    # Network cost estimates table (ASCII)
-    table_lines: List[str] = []
-    in_table = False
-    for l in block:
-        if l.strip().startswith("┌"):
-            in_table = True
-        if in_table:
-            table_lines.append(l)
-        if in_table and l.strip().startswith("└"):
-            break
+    long_moves: List[Tuple[str, str]] = CF_LONG_MOVE_RE.findall(mark_text(buf, marks, "cf_long", "cf_long_end"))
 
     net_rows: List[Dict[str, str]] = []
     if table_lines:
         i = 0
         while i < len(table_lines):
             l = table_lines[i]
-            m = re.search(r"│\s*(0?\.?\d+)\s*gwei\s*│\s*([0-9.]+)\s*│\s*([0-9.]+)\s*│", l)
+            m = CF_NET_ROW_RE.search(l)
             if m:
                 gas_price = m.group(1)
                 avg_eth = m.group(2)
@@ -464,7 +788,7 @@ def parse_connectfour_gas(lines: List[str]) -> Dict[str, Any]:
                 avg_usd2 = ""
                 max_usd2 = ""
                 if i + 1 < len(table_lines):
-                    usd = re.findall(r"\(\$([0-9.]+)", table_lines[i + 1])
+                    usd = CF_NET_USD_RE.findall(table_lines[i + 1])
                     if len(usd) >= 2:
                         avg_usd2 = usd[0]
                         max_usd2 = usd[1]
@@ -485,11 +809,7 @@ def parse_connectfour_gas(lines: List[str]) -> Dict[str, Any]:
     block_text = "\n".join(block)
 
     def op(label: str) -> Dict[str, Optional[str]]:
-        m = re.search(
-            rf"{re.escape(label)}:\s*\n\s*Count:\s*(\d+)\s*\n\s*Total Gas:\s*([\d,]+)\s*\n\s*Average Gas:\s*([\d,]+)",
-            block_text,
-            flags=re.S,
-        )
+        m = CF_OPS_RE[label].search(block_text)
         if not m:
             return {"count": None, "totalGas": None, "avgGas": None}
         return {"count": m.group(1), "totalGas": m.group(2), "avgGas": m.group(3)}
@@ -497,16 +817,7 @@ def parse_connectfour_gas(lines: List[str]) -> Dict[str, Any]:
     ops = {"enrollments": op("ENROLLMENTS"), "moves": op("MOVES")}
 
     return {
-        "playersTracked": players_tracked,
-        "totalGasAll": total_gas_all,
-        "avgGasPerPlayer": avg_gas,
-        "avgCostEth": avg_cost_eth,
-        "avgCostUsd": avg_cost_usd,
-        "maxPlayer": max_player,
-        "maxTotalGas": max_total_gas,
-        "maxTxs": max_txs,
-        "maxCostEth": max_cost_eth,
-        "maxCostUsd": max_cost_usd,
+        **fields,
         "autoStartGas": auto_gas,
         "autoStartEth": auto_eth,
         "autoStartUsd": auto_usd,
@@ -518,45 +829,32 @@ def parse_connectfour_gas(lines: List[str]) -> Dict[str, Any]:
     }
 
 
-def parse_scenarios(lines: List[str]) -> Dict[str, Any]:
-    esc_block = extract_block(
-        lines,
-        lambda l: l.strip() == "=== COMPREHENSIVE ESCALATION TEST ===",
-        lambda l: "COMPREHENSIVE ESCALATION TEST PASSED" in l,
-        include_end=True,
-    )
+def parse_scenarios(buf: Buffer, marks: Dict[str, List[int]]) -> Dict[str, Any]:
+    esc_span = mark_span(buf, marks, "esc_report", "esc_end", include_end=True)
     esc_summary: List[str] = []
     esc_validated: List[str] = []
-    if esc_block:
-        in_summary = False
-        for l in esc_block:
-            if l.strip() == "=== ROUND 0 SUMMARY ===":
-                in_summary = True
-                continue
-            if in_summary:
-                if l.strip().startswith("==="):
+    if esc_span:
+        lo, hi = esc_span
+        # Both sections start at a landmark inside the block; read from there.
+        at = mark_in(marks, "esc_round0", lo, hi)
+        if at is not None:
+            for l in decode_lines(buf, next_line(buf, at), hi):
+                t = l.strip()
+                if t.startswith("==="):
                     break
-                if l.strip():
-                    esc_summary.append(l.strip())
+                if t:
+                    esc_summary.append(t)
 
-        in_validated = False
-        for l in esc_block:
-            if l.strip() == "Validated:":
-                in_validated = True
-                continue
-            if in_validated:
+        at = mark_in(marks, "esc_validated", lo, hi)
+        if at is not None:
+            for l in decode_lines(buf, next_line(buf, at), hi):
                 t = l.strip()
                 if t.startswith("✔"):
                     break
                 if t.startswith("✓"):
                     esc_validated.append(t.lstrip("✓").strip())
 
-    iso_block = extract_block(
-        lines,
-        lambda l: "COMPREHENSIVE TEST SUMMARY" in l,
-        lambda l: "ALL COMPREHENSIVE CHECKS PASSED" in l,
-        include_end=True,
-    )
+    iso_block = mark_block(buf, marks, "iso_report", "iso_end", include_end=True)
     iso_items: List[str] = []
     if iso_block:
         for l in iso_block:
@@ -572,13 +870,49 @@ def parse_scenarios(lines: List[str]) -> Dict[str, Any]:
     }
 
 
-def write_structure_json(suites: List[Dict[str, Any]], total_passing: int, total_pending: int) -> None:
+def parse_summary(buf: Buffer, marks: Dict[str, List[int]]) -> Tuple[int, int, str]:
+    """(passing, pending, duration) from the last Mocha summary lines."""
+    if "summary_pass" not in marks or "summary_pend" not in marks:
+        raise SystemExit("Could not find Mocha summary in test-output.txt")
+    # The classifier already noted where they are; re-match just those lines.
+    m_pass = match_line(buf, marks["summary_pass"][-1])
+    m_pend = match_line(buf, marks["summary_pend"][-1])
+    return int(m_pass.group("pass_count")), int(m_pend.group("pend_count")), group_text(m_pass, "duration")
+
+
+def parse_tictac_gas(buf: Buffer, marks: Dict[str, List[int]]) -> Dict[str, Optional[str]]:
+    # TicTacChain simple gas lines (captured as console logs); the last one wins.
+    # Only lines found to contain the label are searched.
+    def last(kind: str, pat: re.Pattern[str]) -> Optional[str]:
+        for pos in reversed(marks.get(kind, [])):
+            m = pat.search(line_at(buf, pos))
+            if m:
+                return m.group(1)
+        return None
+
+    return {
+        "enroll": last("tictac_enroll", TICTAC_ENROLL_RE),
+        "move": last("tictac_move", TICTAC_MOVE_RE),
+    }
+
+
+def structure_json(suites: List[Dict[str, Any]], total_passing: int, total_pending: int) -> str:
     def to_node(node: Dict[str, Any]) -> Dict[str, Any]:
-        p, q = count_suite(node)
+        # Counts roll up from the already-built children, so each test is
+        # counted once rather than once per enclosing suite.
+        subsuites = [to_node(s) for s in node["subsuites"]]
+        tests = [{"name": t["name"], "status": t["status"]} for t in node["tests"]]
+        p = sum(s["passing"] for s in subsuites)
+        q = sum(s["pending"] for s in subsuites)
+        for t in tests:
+            if t["status"] == "passing":
+                p += 1
+            elif t["status"] == "pending":
+                q += 1
         return {
-            "name": node.get("name", ""),
-            "subsuites": [to_node(s) for s in node.get("subsuites", [])],
-            "tests": [{"name": t["name"], "status": t["status"]} for t in node.get("tests", [])],
+            "name": node["name"],
+            "subsuites": subsuites,
+            "tests": tests,
             "passing": p,
             "pending": q,
         }
@@ -591,32 +925,23 @@ def write_structure_json(suites: List[Dict[str, Any]], total_passing: int, total
         "successRate": f"{(total_passing / total * 100.0) if total else 0.0:.1f}",
         "suites": [to_node(s) for s in suites],
     }
-    OUT_RESULTS.write_text(json.dumps(out, indent=2), encoding="utf-8")
-    OUT_STRUCTURE.write_text(json.dumps(out, indent=2), encoding="utf-8")
+    return json.dumps(out, indent=2)
+
+
+def write_structure_json(text: str) -> None:
+    # Both files carry the same document: write it once and copy the bytes.
+    OUT_RESULTS.write_text(text, encoding="utf-8")
+    shutil.copyfile(OUT_RESULTS, OUT_STRUCTURE)
 
 
 def render_check_list(items: List[str]) -> str:
     if not items:
         return "<p style=\"color: #94a3b8;\">(No scenario output captured.)</p>"
-    li = "\n".join(f"<li>{esc(x)}</li>" for x in items)
-    return f"<ul class=\"checkmark-list\">{li}</ul>"
+    return '<ul class="checkmark-list"><li>%s</li></ul>' % "</li>\n<li>".join(map(esc, items))
 
 
-def render_html(
-    *,
-    lines: List[str],
-    run_dt: dt.datetime,
-    total_passing: int,
-    total_pending: int,
-    duration: str,
-    suites: List[Dict[str, Any]],
-    flat_tests: List[Tuple[List[str], Dict[str, Any]]],
-    scenarios: Dict[str, Any],
-    cf: Dict[str, Any],
-    arb: Dict[str, Any],
-) -> str:
-    css = extract_css_from_base()
-    extra_css = """
+# Report-only styles added after the stylesheet shared with test-report.html.
+EXTRA_CSS = """
         details {
             background: #0f172a;
             border: 1px solid #334155;
@@ -678,249 +1003,9 @@ def render_html(
         }
     """
 
-    total = total_passing + total_pending
-    success_rate = (total_passing / total * 100.0) if total else 0.0
-    run_date = run_dt.strftime("%B %-d, %Y")
-    run_time = run_dt.strftime("%H:%M")
-
-    # Build module/group stats and category stats
-    group_stats: Dict[str, Dict[str, int]] = {}
-    category_stats: Dict[str, Dict[str, int]] = {}
-    group_category_stats: Dict[str, Dict[str, Dict[str, int]]] = {}
-    pending_by_suite: Dict[str, List[str]] = {}
-    slow_tests: List[Tuple[str, str, int]] = []
-
-    for path, t in flat_tests:
-        group = group_for_path(path)
-        cat = category_for_test(path, t["name"])
-        group_stats.setdefault(group, {"passing": 0, "pending": 0})
-        category_stats.setdefault(cat, {"passing": 0, "pending": 0})
-        group_category_stats.setdefault(group, {}).setdefault(cat, {"passing": 0, "pending": 0})
-        group_stats[group][t["status"]] += 1
-        category_stats[cat][t["status"]] += 1
-        group_category_stats[group][cat][t["status"]] += 1
-
-        if t["status"] == "pending":
-            suite_name = " / ".join([p for p in path if p]) or "(unknown suite)"
-            pending_by_suite.setdefault(suite_name, []).append(t["name"])
-
-        if t.get("ms") is not None:
-            suite_name = " / ".join([p for p in path if p])
-            slow_tests.append((t["name"], suite_name, int(t["ms"])))
-
-    slow_tests.sort(key=lambda x: -x[2])
-    slow_tests = slow_tests[:15]
-
-    def badge(p: int, q: int) -> str:
-        out = f'<span class="badge success">{p} PASSING</span>'
-        if q:
-            out += f' <span class="badge warning">{q} PENDING</span>'
-        return out
-
-    def progress(p: int, q: int) -> float:
-        tot = p + q
-        return (p / tot * 100.0) if tot else 0.0
-
-    category_descriptions = {
-        "Game & Tournament Logic": "Core gameplay, enrollment, bracket progression, and correctness of state transitions.",
-        "Escalation & Timeouts": "Anti-stalling flows (EL*/ML*) and all timing/eligibility boundary checks.",
-        "Economics & Prizes": "Entry fee splits, prize distribution, rounding/wei integrity, raffles, and earnings.",
-        "All-Draw Resolution": "Finals/semi/round-all-draw scenarios and fair payout splitting.",
-        "Views & Data Integrity": "View functions used by UIs: match/tournament data, leaderboards, stats, and persistence.",
-        "Events & Records": "Event emissions and record-keeping correctness (e.g., Transfer, records/mappings).",
-        "Edge Cases & Regression": "Known bugs/edge cases prevented from regressing (cache, finals persistence, etc.).",
-        "Gas & Performance": "Gas measurements, capacity testing, storage growth, and scale/stress behaviors.",
-    }
-
-    group_order = [
-        "ConnectFourOnChain",
-        "ChessOnChain",
-        "TicTacChain",
-        "Protocol Core",
-        "Gas & Performance",
-        "Gas & Storage",
-    ]
-
-    group_cards = []
-    groups_sorted = sorted(
-        group_stats.items(),
-        key=lambda kv: (
-            group_order.index(kv[0]) if kv[0] in group_order else 999,
-            -sum(kv[1].values()),
-            kv[0],
-        ),
-    )
-
-    for g, st in groups_sorted:
-        p = st["passing"]
-        q = st["pending"]
-
-        # Per-group category breakdown
-        cats = []
-        for cat, cst in sorted(
-            group_category_stats.get(g, {}).items(),
-            key=lambda kv: (-sum(kv[1].values()), kv[0]),
-        ):
-            cp = cst["passing"]
-            cq = cst["pending"]
-            label = f"{cat} ({cp + cq} tests)"
-            status = f"{cp} passing" + (f" • {cq} pending" if cq else "")
-            cats.append(
-                f"""
-                <div class="info-card">
-                    <h4>{esc(label)}</h4>
-                    <p>{esc(category_descriptions.get(cat, ""))}<br><span class="status-ok">{esc(status)}</span></p>
-                </div>
-                """
-            )
-        cats_html = f'<div class="info-grid">{"".join(cats[:6])}</div>' if cats else ""
-
-        group_cards.append(
-            f"""
-            <div class="test-suite">
-                <h3>
-                    <span>{esc(g)}</span>
-                    {badge(p, q)}
-                </h3>
-                <div class="progress-bar">
-                    <div class="progress-fill" style="width: {progress(p, q):.1f}%;"></div>
-                </div>
-                <p style="color: #cbd5e1; margin-top: 10px;">
-                    <strong>{p + q} tests</strong> (grouped by suite/test names)
-                </p>
-                {cats_html}
-            </div>
-            """
-        )
-
-    cat_cards = []
-    for cat, st in sorted(category_stats.items(), key=lambda kv: (-sum(kv[1].values()), kv[0])):
-        p = st["passing"]
-        q = st["pending"]
-        tot = p + q
-        status = f'<div style="margin-top: 10px; color: #10b981; font-weight: 600;">PASSING: {p}</div>'
-        if q:
-            status = f'<div style="margin-top: 10px; color: #f59e0b; font-weight: 600;">PASSING: {p} • PENDING: {q}</div>'
-        cat_cards.append(
-            f"""
-            <div class="edge-case-card">
-                <div class="icon">•</div>
-                <h5>{esc(cat)}</h5>
-                <p><strong>{tot} tests</strong> tagged under this category (heuristic).</p>
-                {status}
-            </div>
-            """
-        )
-
-    pending_blocks = []
-    for suite_name, tests in sorted(pending_by_suite.items(), key=lambda kv: (-len(kv[1]), kv[0])):
-        li = "\n".join(f"<li>{esc(t)}</li>" for t in tests)
-        pending_blocks.append(
-            f"""
-            <div class="info-card" style="border-left-color: #f59e0b;">
-                <h4>{esc(suite_name)} <span class="badge warning">{len(tests)} PENDING</span></h4>
-                <ul class="checkmark-list">{li}</ul>
-            </div>
-            """
-        )
-
-    slow_rows = "\n".join(
-        f"<tr><td>{esc(name)}</td><td>{esc(suite)}</td><td><span class=\"gas-value\">{ms}ms</span></td></tr>"
-        for name, suite, ms in slow_tests
-    )
-
-    # ConnectFour gas tables
-    cf_net_rows = ""
-    if cf.get("networkRows"):
-        cf_net_rows = "\n".join(
-            "<tr>"
-            f"<td><strong>{esc(r['gasPrice'])} gwei</strong></td>"
-            f"<td><span class=\"cost-value\">{esc(r['avgEth'])} ETH</span> <span style=\"color:#64748b;\">(${esc(r['avgUsd'])})</span></td>"
-            f"<td><span class=\"cost-value\">{esc(r['maxEth'])} ETH</span> <span style=\"color:#64748b;\">(${esc(r['maxUsd'])})</span></td>"
-            "</tr>"
-            for r in cf["networkRows"]
-        )
-
-    cf_long_rows = ""
-    if cf.get("longGameMoves"):
-        cf_long_rows = "\n".join(
-            f"<tr><td>{esc(mv)}</td><td><span class=\"gas-value\">{esc(g)}</span></td></tr>"
-            for mv, g in cf["longGameMoves"]
-        )
-
-    cf_ops_rows = ""
-    if cf.get("ops"):
-        rows = []
-        for label, key in (("Enrollments", "enrollments"), ("Moves", "moves")):
-            d = cf["ops"].get(key, {})
-            rows.append(
-                f"<tr><td><strong>{label}</strong></td><td>{esc(d.get('count') or 'N/A')}</td>"
-                f"<td><span class=\"gas-value\">{esc(d.get('avgGas') or 'N/A')}</span></td>"
-                f"<td><span class=\"gas-value\">{esc(d.get('totalGas') or 'N/A')}</span></td></tr>"
-            )
-        cf_ops_rows = "\n".join(rows)
-
-    # Arbitrum avg rows
-    arb_avg_rows = ""
-    if arb.get("avgRows"):
-        arb_avg_rows = "\n".join(
-            "<tr>"
-            f"<td><span class=\"gas-value\">{esc(r['match'])}</span></td>"
-            f"<td><span class=\"gas-value\">{esc(r['enroll'])}</span></td>"
-            f"<td>{esc(r['m1'])}</td>"
-            f"<td>{esc(r['m2'])}</td>"
-            f"<td>{esc(r['m3'])}</td>"
-            f"<td><span class=\"gas-value\">{esc(r['m4'])}</span></td>"
-            f"<td><span class=\"gas-value\">{esc(r['total'])}</span></td>"
-            f"<td>{esc(r['delta'])}</td>"
-            "</tr>"
-            for r in arb["avgRows"]
-        )
-
-    arb_proj_rows = ""
-    if arb.get("projections"):
-        arb_proj_rows = "\n".join(
-            "<tr>"
-            f"<td><strong>{esc(p['players'])}</strong></td>"
-            f"<td>{esc(p['matches'])}</td>"
-            f"<td><span class=\"gas-value\">{esc(p['records'])}</span></td>"
-            f"<td><span class=\"cost-value\">{esc(p['storage'])}</span></td>"
-            "</tr>"
-            for p in arb["projections"]
-        )
-
-    # TicTacChain simple gas lines (captured as console logs)
-    tictac_enroll = None
-    tictac_move = None
-    for l in lines:
-        m = re.search(r"Gas used for enrollment:\s*(\d+)", l)
-        if m:
-            tictac_enroll = m.group(1)
-        m = re.search(r"Gas used for move:\s*(\d+)", l)
-        if m:
-            tictac_move = m.group(1)
-
-    tictac_metrics = ""
-    if tictac_enroll or tictac_move:
-        parts = []
-        if tictac_enroll:
-            parts.append(
-                f'<div class="metric-row"><span class="metric-label">Enrollment Gas</span><span class="metric-value">{parse_int(tictac_enroll):,}</span></div>'
-            )
-        if tictac_move:
-            parts.append(
-                f'<div class="metric-row"><span class="metric-label">Move Gas</span><span class="metric-value">{parse_int(tictac_move):,}</span></div>'
-            )
-        tictac_metrics = "".join(parts)
-
-    # Scenarios
-    esc_summary = scenarios.get("escalation", {}).get("round0Summary", [])
-    esc_valid = scenarios.get("escalation", {}).get("validated", [])
-    iso_items = scenarios.get("isolation", {}).get("items", [])
-
-    raw_console = "\n".join(lines)
-
-    return f"""<!DOCTYPE html>
+# The report page; "{raw_console}" marks where the console dump is streamed,
+# so the shell is split there once and each half filled with format_map.
+REPORT_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
   <meta charset="UTF-8">
@@ -937,7 +1022,7 @@ def render_html(
       <div class="header-content">
         <h1>ETour Protocol Test Report (Alpha)</h1>
         <p class="subtitle">Scenario-oriented report hydrated from console output</p>
-        <p class="subtitle">Generated {esc(run_date)} at {esc(run_time)}</p>
+        <p class="subtitle">Generated {run_date} at {run_time}</p>
         <div class="confidence-badge">{success_rate:.1f}% SUCCESS • {total_passing} PASSING • {total_pending} PENDING</div>
       </div>
     </div>
@@ -964,7 +1049,7 @@ def render_html(
         <div class="sublabel">Future work</div>
       </div>
       <div class="stat-card time">
-        <div class="number">{esc(duration)}</div>
+        <div class="number">{duration}</div>
         <div class="label">Duration</div>
         <div class="sublabel">Full run</div>
       </div>
@@ -986,11 +1071,11 @@ def render_html(
         <div class="info-grid">
           <div class="info-card">
             <h4>Round 0 Summary</h4>
-            {render_check_list(esc_summary)}
+            {escalation_summary}
           </div>
           <div class="info-card" style="border-left-color: #10b981;">
             <h4>Validated</h4>
-            {render_check_list(esc_valid)}
+            {escalation_validated}
           </div>
         </div>
       </div>
@@ -1000,7 +1085,7 @@ def render_html(
         <p style="color: #94a3b8; margin-bottom: 15px;">
           Extracted from the comprehensive multi-tournament isolation test summary.
         </p>
-        {render_check_list(iso_items)}
+        {isolation_items}
       </div>
     </div>
 
@@ -1018,32 +1103,32 @@ def render_html(
         <div class="info-card" style="border-left-color: #10b981;">
           <h4>Saturation</h4>
           <p>
-            <strong class="gas-value">{esc(cf.get('saturationPlayers') or 'N/A')} players</strong><br>
-            <strong class="cost-value">{esc(cf.get('saturationTournaments') or 'N/A')} active tournaments</strong>
+            <strong class="gas-value">{cf_saturation_players} players</strong><br>
+            <strong class="cost-value">{cf_saturation_tournaments} active tournaments</strong>
           </p>
         </div>
         <div class="info-card" style="border-left-color: #06b6d4;">
           <h4>Auto-Start (Capacity Trigger)</h4>
           <p>
-            <strong class="gas-value">{esc(cf.get('autoStartGas') or 'N/A')} gas</strong><br>
-            <strong class="cost-value">{esc((cf.get('autoStartEth') or 'N/A') + ' ETH')}</strong>
-            <span style="color: #64748b;">(${esc(cf.get('autoStartUsd') or 'N/A')})</span>
+            <strong class="gas-value">{cf_auto_gas} gas</strong><br>
+            <strong class="cost-value">{cf_auto_eth}</strong>
+            <span style="color: #64748b;">(${cf_auto_usd})</span>
           </p>
         </div>
         <div class="info-card" style="border-left-color: #8b5cf6;">
           <h4>Avg Player Cost</h4>
           <p>
-            <strong class="gas-value">{esc(cf.get('avgGasPerPlayer') or 'N/A')} gas</strong><br>
-            <strong class="cost-value">{esc((cf.get('avgCostEth') or 'N/A') + ' ETH')}</strong>
-            <span style="color: #64748b;">(${esc(cf.get('avgCostUsd') or 'N/A')})</span>
+            <strong class="gas-value">{cf_avg_gas} gas</strong><br>
+            <strong class="cost-value">{cf_avg_eth}</strong>
+            <span style="color: #64748b;">(${cf_avg_usd})</span>
           </p>
         </div>
         <div class="info-card" style="border-left-color: #ef4444;">
           <h4>Max Cost Player</h4>
           <p>
-            <strong class="gas-value">{esc(cf.get('maxTotalGas') or 'N/A')} gas</strong><br>
-            <span style="color: #94a3b8; font-family: monospace;">{esc(cf.get('maxPlayer') or 'N/A')}</span><br>
-            <span style="color: #64748b;">{esc(cf.get('maxTxs') or 'N/A')} txs</span>
+            <strong class="gas-value">{cf_max_total_gas} gas</strong><br>
+            <span style="color: #94a3b8; font-family: monospace;">{cf_max_player}</span><br>
+            <span style="color: #64748b;">{cf_max_txs} txs</span>
           </p>
         </div>
       </div>
@@ -1093,24 +1178,24 @@ def render_html(
       <div class="info-grid">
         <div class="info-card" style="border-left-color: #06b6d4;">
           <h4>Total Matches Simulated</h4>
-          <p><strong class="gas-value">{esc(arb.get('totalMatches') or 'N/A')}</strong></p>
+          <p><strong class="gas-value">{arb_total_matches}</strong></p>
         </div>
         <div class="info-card" style="border-left-color: #10b981;">
           <h4>Avg Total Gas (First)</h4>
-          <p><strong class="gas-value">{esc(arb.get('firstTotal') or 'N/A')}</strong></p>
+          <p><strong class="gas-value">{arb_first_total}</strong></p>
         </div>
         <div class="info-card" style="border-left-color: #10b981;">
           <h4>Avg Total Gas (Last)</h4>
           <p>
-            <strong class="gas-value">{esc(arb.get('lastTotal') or 'N/A')}</strong><br>
-            <span style="color:#64748b;">match {esc(str(arb.get('lastMatchN') or 'N/A'))}</span>
+            <strong class="gas-value">{arb_last_total}</strong><br>
+            <span style="color:#64748b;">match {arb_last_match_n}</span>
           </p>
         </div>
         <div class="info-card" style="border-left-color: #8b5cf6;">
           <h4>Storage Size</h4>
           <p>
-            <strong class="gas-value">{esc(arb.get('totalStorageBytes') or 'N/A')} bytes</strong><br>
-            <span style="color:#64748b;">{esc((arb.get('totalStorageMB') or 'N/A') + ' MB')}</span>
+            <strong class="gas-value">{arb_storage_bytes} bytes</strong><br>
+            <span style="color:#64748b;">{arb_storage_mb}</span>
           </p>
         </div>
       </div>
@@ -1153,24 +1238,24 @@ def render_html(
       <div class="highlight-box" style="margin-top: 35px;">
         <h4>TicTacChain Gas Checks</h4>
         <p>Captured from the console logs in <code>Gas Optimization</code> tests.</p>
-        {tictac_metrics if tictac_metrics else '<p style="color:#94a3b8;">(No TicTacChain gas metrics found in console output.)</p>'}
+        {tictac_metrics}
       </div>
     </div>
 
     <div class="section">
       <h2>Test Suite Breakdown</h2>
-      {''.join(group_cards)}
+      {group_cards}
 
       <h3 style="color: #e2e8f0; margin: 35px 0 20px 0;">Coverage by Category (Heuristic)</h3>
       <div class="edge-case-grid">
-        {''.join(cat_cards)}
+        {cat_cards}
       </div>
     </div>
 
     <div class="section" style="background: #0f172a;">
       <h2>Pending Tests</h2>
       <div class="info-grid">
-        {''.join(pending_blocks) if pending_blocks else '<p style="color:#94a3b8;">(No pending tests.)</p>'}
+        {pending_blocks}
       </div>
     </div>
 
@@ -1191,7 +1276,7 @@ def render_html(
       </p>
       <details>
         <summary>Show raw output</summary>
-        <pre>{esc(raw_console)}</pre>
+        <pre>{raw_console}</pre>
       </details>
     </div>
 
@@ -1203,49 +1288,385 @@ def render_html(
 </body>
 </html>
 """
+REPORT_HEAD, REPORT_TAIL = REPORT_TEMPLATE.split("{raw_console}")
 
 
-def main() -> None:
-    if not TEST_OUTPUT.exists():
-        raise SystemExit(f"Missing {TEST_OUTPUT}")
+def render_html(
+    *,
+    css: str,
+    run_dt: dt.datetime,
+    total_passing: int,
+    total_pending: int,
+    duration: str,
+    suites: List[Dict[str, Any]],
+    suite_tests: Iterable[Tuple[Tuple[str, ...], List[Dict[str, Any]]]],
+    scenarios: Dict[str, Any],
+    cf: Dict[str, Any],
+    arb: Dict[str, Any],
+    tictac: Dict[str, Optional[str]],
+) -> Tuple[str, str]:
+    """The report page before and after the raw console dump (see render_console)."""
+    # Local alias: escaping runs per cell, card and list item below.
+    e = esc
+
+    total = total_passing + total_pending
+    success_rate = (total_passing / total * 100.0) if total else 0.0
+    run_date = run_dt.strftime("%B %-d, %Y")
+    run_time = run_dt.strftime("%H:%M")
 
-    lines = TEST_OUTPUT.read_text(encoding="utf-8", errors="replace").splitlines()
+    # Count tests per (group, category, status); group and category totals are
+    # projected from these counts once the loop is done.
+    stats: Counter[Tuple[str, str, str]] = Counter()
+    pending_by_suite: Dict[str, List[str]] = {}
+    # The 15 slowest tests as a bounded min-heap of (ms, -seq, name, suite);
+    # -seq keeps the earlier of two equally slow tests.
+    slow_heap: List[Tuple[int, int, str, str]] = []
+
+    seq = 0
+    for path, tests in suite_tests:
+        suite_name = " / ".join([p for p in path if p])
+        for t in tests:
+            group, cat = classify(path, t["name"])
+            stats[group, cat, t["status"]] += 1
+
+            if t["status"] == "pending":
+                pending_by_suite.setdefault(suite_name or "(unknown suite)", []).append(t["name"])
+
+            if t.get("ms") is not None:
+                seq += 1
+                entry = (int(t["ms"]), -seq, t["name"], suite_name)
+                if len(slow_heap) < 15:
+                    heapq.heappush(slow_heap, entry)
+                else:
+                    heapq.heappushpop(slow_heap, entry)
+
+    slow_tests = [(name, suite, ms) for ms, _, name, suite in sorted(slow_heap, reverse=True)]
 
-    m_pass = last_match(lines, SUMMARY_PASS_RE)
-    m_pend = last_match(lines, SUMMARY_PEND_RE)
-    if not m_pass or not m_pend:
-        raise SystemExit("Could not find Mocha summary in test-output.txt")
+    group_stats: Dict[str, Dict[str, int]] = {}
+    category_stats: Dict[str, Dict[str, int]] = {}
+    group_category_stats: Dict[str, Dict[str, Dict[str, int]]] = {}
+    for (group, cat, status), n in stats.items():
+        group_stats.setdefault(group, {"passing": 0, "pending": 0})[status] += n
+        category_stats.setdefault(cat, {"passing": 0, "pending": 0})[status] += n
+        group_category_stats.setdefault(group, {}).setdefault(cat, {"passing": 0, "pending": 0})[status] += n
+
+    def badge(p: int, q: int) -> str:
+        out = f'<span class="badge success">{p} PASSING</span>'
+        if q:
+            out += f' <span class="badge warning">{q} PENDING</span>'
+        return out
+
+    def progress(p: int, q: int) -> float:
+        tot = p + q
+        return (p / tot * 100.0) if tot else 0.0
+
+    category_descriptions = {
+        "Game & Tournament Logic": "Core gameplay, enrollment, bracket progression, and correctness of state transitions.",
+        "Escalation & Timeouts": "Anti-stalling flows (EL*/ML*) and all timing/eligibility boundary checks.",
+        "Economics & Prizes": "Entry fee splits, prize distribution, rounding/wei integrity, raffles, and earnings.",
+        "All-Draw Resolution": "Finals/semi/round-all-draw scenarios and fair payout splitting.",
+        "Views & Data Integrity": "View functions used by UIs: match/tournament data, leaderboards, stats, and persistence.",
+        "Events & Records": "Event emissions and record-keeping correctness (e.g., Transfer, records/mappings).",
+        "Edge Cases & Regression": "Known bugs/edge cases prevented from regressing (cache, finals persistence, etc.).",
+        "Gas & Performance": "Gas measurements, capacity testing, storage growth, and scale/stress behaviors.",
+    }
 
-    total_passing = int(m_pass.group(1))
-    duration = m_pass.group(2)
-    total_pending = int(m_pend.group(1))
-    run_dt = dt.datetime.fromtimestamp(TEST_OUTPUT.stat().st_mtime)
-
-    suites = parse_suite_tree(lines)
-    write_structure_json(suites, total_passing, total_pending)
-
-    flat: List[Tuple[List[str], Dict[str, Any]]] = []
-    for s in suites:
-        flat.extend(flatten_tests(s, []))
-
-    scenarios = parse_scenarios(lines)
-    cf = parse_connectfour_gas(lines)
-    arb = parse_arbitrum_gas(lines)
-
-    html_out = render_html(
-        lines=lines,
-        run_dt=run_dt,
-        total_passing=total_passing,
-        total_pending=total_pending,
-        duration=duration,
-        suites=suites,
-        flat_tests=flat,
-        scenarios=scenarios,
-        cf=cf,
-        arb=arb,
+    group_order = [
+        "ConnectFourOnChain",
+        "ChessOnChain",
+        "TicTacChain",
+        "Protocol Core",
+        "Gas & Performance",
+        "Gas & Storage",
+    ]
+
+    groups_sorted = sorted(
+        group_stats.items(),
+        key=lambda kv: (
+            group_order.index(kv[0]) if kv[0] in group_order else 999,
+            -sum(kv[1].values()),
+            kv[0],
+        ),
     )
 
-    OUT_HTML.write_text(html_out, encoding="utf-8")
+    def category_card(cat: str, cst: Dict[str, int]) -> str:
+        cp = cst["passing"]
+        cq = cst["pending"]
+        label = f"{cat} ({cp + cq} tests)"
+        status = f"{cp} passing" + (f" • {cq} pending" if cq else "")
+        return """
+                <div class="info-card">
+                    <h4>%s</h4>
+                    <p>%s<br><span class="status-ok">%s</span></p>
+                </div>
+                """ % (e(label), e(category_descriptions.get(cat, "")), e(status))
+
+    # Each card is one complete %-template appended to a shared buffer, which
+    # is joined once per section.
+    buf: List[str] = []
+    emit = buf.append
+
+    for g, st in groups_sorted:
+        p = st["passing"]
+        q = st["pending"]
+
+        # Per-group category breakdown (top six)
+        cats = sorted(
+            group_category_stats.get(g, {}).items(),
+            key=lambda kv: (-sum(kv[1].values()), kv[0]),
+        )[:6]
+        cats_html = '<div class="info-grid">%s</div>' % "".join(category_card(*kv) for kv in cats) if cats else ""
+
+        emit(
+            """
+            <div class="test-suite">
+                <h3>
+                    <span>%s</span>
+                    %s
+                </h3>
+                <div class="progress-bar">
+                    <div class="progress-fill" style="width: %.1f%%;"></div>
+                </div>
+                <p style="color: #cbd5e1; margin-top: 10px;">
+                    <strong>%d tests</strong> (grouped by suite/test names)
+                </p>
+                %s
+            </div>
+            """
+            % (e(g), badge(p, q), progress(p, q), p + q, cats_html)
+        )
+    group_cards = "".join(buf)
+    buf.clear()
+
+    for cat, st in sorted(category_stats.items(), key=lambda kv: (-sum(kv[1].values()), kv[0])):
+        p = st["passing"]
+        q = st["pending"]
+        if q:
+            status = '<div style="margin-top: 10px; color: #f59e0b; font-weight: 600;">PASSING: %d • PENDING: %d</div>' % (p, q)
+        else:
+            status = '<div style="margin-top: 10px; color: #10b981; font-weight: 600;">PASSING: %d</div>' % p
+        emit(
+            """
+            <div class="edge-case-card">
+                <div class="icon">•</div>
+                <h5>%s</h5>
+                <p><strong>%d tests</strong> tagged under this category (heuristic).</p>
+                %s
+            </div>
+            """
+            % (e(cat), p + q, status)
+        )
+    cat_cards = "".join(buf)
+    buf.clear()
+
+    for suite_name, tests in sorted(pending_by_suite.items(), key=lambda kv: (-len(kv[1]), kv[0])):
+        emit(
+            """
+            <div class="info-card" style="border-left-color: #f59e0b;">
+                <h4>%s <span class="badge warning">%d PENDING</span></h4>
+                <ul class="checkmark-list"><li>%s</li></ul>
+            </div>
+            """
+            % (e(suite_name), len(tests), "</li>\n<li>".join(map(e, tests)))
+        )
+    pending_blocks = "".join(buf)
+    buf.clear()
+
+    slow_rows = "\n".join(
+        [
+            '<tr><td>%s</td><td>%s</td><td><span class="gas-value">%dms</span></td></tr>'
+            % (e(name), e(suite), ms)
+            for name, suite, ms in slow_tests
+        ]
+    )
+
+    # Table rows: one %-template per row, filled from the escaped cells, go
+    # into the same buffer; take_rows() joins them one per line.
+    def take_rows() -> str:
+        out = "\n".join(buf)
+        buf.clear()
+        return out
+
+    # ConnectFour gas tables
+    for r in cf.get("networkRows") or ():
+        emit(
+            '<tr><td><strong>%s gwei</strong></td>'
+            '<td><span class="cost-value">%s ETH</span> <span style="color:#64748b;">($%s)</span></td>'
+            '<td><span class="cost-value">%s ETH</span> <span style="color:#64748b;">($%s)</span></td></tr>'
+            % tuple(map(e, (r["gasPrice"], r["avgEth"], r["avgUsd"], r["maxEth"], r["maxUsd"])))
+        )
+    cf_net_rows = take_rows()
+
+    for mv, g in cf.get("longGameMoves") or ():
+        emit('<tr><td>%s</td><td><span class="gas-value">%s</span></td></tr>' % (e(mv), e(g)))
+    cf_long_rows = take_rows()
+
+    if cf.get("ops"):
+        for label, key in (("Enrollments", "enrollments"), ("Moves", "moves")):
+            d = cf["ops"].get(key, {})
+            emit(
+                '<tr><td><strong>%s</strong></td><td>%s</td>'
+                '<td><span class="gas-value">%s</span></td><td><span class="gas-value">%s</span></td></tr>'
+                % (label, e(d.get("count") or "N/A"), e(d.get("avgGas") or "N/A"), e(d.get("totalGas") or "N/A"))
+            )
+    cf_ops_rows = take_rows()
+
+    # Arbitrum avg rows
+    for r in arb.get("avgRows") or ():
+        emit(
+            '<tr><td><span class="gas-value">%s</span></td><td><span class="gas-value">%s</span></td>'
+            '<td>%s</td><td>%s</td><td>%s</td>'
+            '<td><span class="gas-value">%s</span></td><td><span class="gas-value">%s</span></td><td>%s</td></tr>'
+            % tuple(map(e, (r[k] for k in ARB_ROW_KEYS)))
+        )
+    arb_avg_rows = take_rows()
+
+    for proj in arb.get("projections") or ():
+        emit(
+            '<tr><td><strong>%s</strong></td><td>%s</td>'
+            '<td><span class="gas-value">%s</span></td><td><span class="cost-value">%s</span></td></tr>'
+            % tuple(map(e, (proj["players"], proj["matches"], proj["records"], proj["storage"])))
+        )
+    arb_proj_rows = take_rows()
+
+    # TicTacChain simple gas lines (captured as console logs), grouped once each
+    tictac_gas = [
+        (label, f"{parse_int(v):,}")
+        for label, v in (("Enrollment Gas", tictac.get("enroll")), ("Move Gas", tictac.get("move")))
+        if v
+    ]
+    tictac_metrics = "".join(
+        '<div class="metric-row"><span class="metric-label">%s</span><span class="metric-value">%s</span></div>' % row
+        for row in tictac_gas
+    )
+
+    # Scenarios
+    esc_summary = scenarios.get("escalation", {}).get("round0Summary", [])
+    esc_valid = scenarios.get("escalation", {}).get("validated", [])
+    iso_items = scenarios.get("isolation", {}).get("items", [])
+
+    # Escaped scalar report values; missing or empty ones fall back to "N/A".
+    cfe = {k: e(v) for k, v in cf.items() if v and isinstance(v, str)}
+    arbe = {k: esc_str(v) for k, v in arb.items() if v and isinstance(v, (str, int))}
+
+    fields = {
+        "css": css,
+        "extra_css": EXTRA_CSS,
+        "run_date": e(run_date),
+        "run_time": e(run_time),
+        "success_rate": success_rate,
+        "total_passing": total_passing,
+        "total_pending": total_pending,
+        "total": total,
+        "duration": e(duration),
+        "escalation_summary": render_check_list(esc_summary),
+        "escalation_validated": render_check_list(esc_valid),
+        "isolation_items": render_check_list(iso_items),
+        "cf_saturation_players": cfe.get("saturationPlayers", "N/A"),
+        "cf_saturation_tournaments": cfe.get("saturationTournaments", "N/A"),
+        "cf_auto_gas": cfe.get("autoStartGas", "N/A"),
+        "cf_auto_eth": cfe.get("autoStartEth", "N/A") + " ETH",
+        "cf_auto_usd": cfe.get("autoStartUsd", "N/A"),
+        "cf_avg_gas": cfe.get("avgGasPerPlayer", "N/A"),
+        "cf_avg_eth": cfe.get("avgCostEth", "N/A") + " ETH",
+        "cf_avg_usd": cfe.get("avgCostUsd", "N/A"),
+        "cf_max_total_gas": cfe.get("maxTotalGas", "N/A"),
+        "cf_max_player": cfe.get("maxPlayer", "N/A"),
+        "cf_max_txs": cfe.get("maxTxs", "N/A"),
+        "cf_net_rows": cf_net_rows,
+        "cf_long_rows": cf_long_rows,
+        "cf_ops_rows": cf_ops_rows,
+        "arb_total_matches": arbe.get("totalMatches", "N/A"),
+        "arb_first_total": arbe.get("firstTotal", "N/A"),
+        "arb_last_total": arbe.get("lastTotal", "N/A"),
+        "arb_last_match_n": arbe.get("lastMatchN", "N/A"),
+        "arb_storage_bytes": arbe.get("totalStorageBytes", "N/A"),
+        "arb_storage_mb": arbe.get("totalStorageMB", "N/A") + " MB",
+        "arb_avg_rows": arb_avg_rows,
+        "arb_proj_rows": arb_proj_rows,
+        "tictac_metrics": tictac_metrics
+        or '<p style="color:#94a3b8;">(No TicTacChain gas metrics found in console output.)</p>',
+        "group_cards": group_cards,
+        "cat_cards": cat_cards,
+        "pending_blocks": pending_blocks or '<p style="color:#94a3b8;">(No pending tests.)</p>',
+        "slow_rows": slow_rows,
+    }
+
+    return REPORT_HEAD.format_map(fields), REPORT_TAIL.format_map(fields)
+
+
+def render_console(raw: Buffer) -> Iterator[str]:
+    """The raw console, decoded and escaped a slice at a time (trailing newline left out)."""
+    raw_end = len(raw) - (raw[-1:] == b"\n")
+    raw_decode = codecs.getincrementaldecoder("utf-8")(errors="replace").decode
+    for i in range(0, raw_end, RAW_SLICE):
+        yield esc(raw_decode(raw[i : min(i + RAW_SLICE, raw_end)]))
+    yield esc(raw_decode(b"", final=True))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate test-report-alpha.html from test-output.txt.")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the inputs are unchanged")
+    args = parser.parse_args(argv)
+
+    if not TEST_OUTPUT.exists():
+        raise SystemExit(f"Missing {TEST_OUTPUT}")
+    st = TEST_OUTPUT.stat()
+
+    # Nothing to do if the console, the base stylesheet and this script are all
+    # unchanged since the outputs were built.
+    stamp_file = OUT_HTML.with_suffix(".cache")
+    stamp = " ".join(
+        f"{s.st_mtime_ns}:{s.st_size}" for s in (st, BASE_REPORT.stat(), Path(__file__).stat())
+    )
+    if (
+        not args.force
+        and all(p.exists() for p in (OUT_HTML, OUT_RESULTS, OUT_STRUCTURE))
+        and stamp_file.exists()
+        and stamp_file.read_text(encoding="utf-8") == stamp
+    ):
+        return
+
+    css = extract_css_from_base()
+    with map_output(TEST_OUTPUT) as buf:
+        # Single pass over the console: the suite tree consumes the event stream
+        # while the summary and rule lines are noted alongside the landmarks.
+        marks = find_landmarks(buf)
+        suites = parse_suite_tree(record_marks(scan(buf), marks))
+
+        total_passing, total_pending, duration = parse_summary(buf, marks)
+        run_dt = dt.datetime.fromtimestamp(st.st_mtime)
+
+        write_structure_json(structure_json(suites, total_passing, total_pending))
+
+        scenarios = parse_scenarios(buf, marks)
+        cf = parse_connectfour_gas(buf, marks)
+        arb = parse_arbitrum_gas(buf, marks)
+        tictac = parse_tictac_gas(buf, marks)
+
+        # The whole page around the console dump is built before the report is
+        # opened (and truncated), so a failure there leaves the old one intact.
+        head, tail = render_html(
+            css=css,
+            run_dt=run_dt,
+            total_passing=total_passing,
+            total_pending=total_pending,
+            duration=duration,
+            suites=suites,
+            suite_tests=iter_suite_tests(suites),
+            scenarios=scenarios,
+            cf=cf,
+            arb=arb,
+            tictac=tictac,
+        )
+        # Only the console is streamed; the text layer encodes each slice as it
+        # is written, and a buffer that size keeps syscalls few.
+        with OUT_HTML.open("w", encoding="utf-8", buffering=RAW_SLICE) as f:
+            f.write(head)
+            f.writelines(render_console(buf))
+            f.write(tail)
+
+    stamp_file.write_text(stamp, encoding="utf-8")
 
 
 if __name__ == "__main__":